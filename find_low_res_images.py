@@ -8,9 +8,16 @@ import os
 import sys
 from pathlib import Path
 from PIL import Image
-from collections import defaultdict
+from collections import Counter, namedtuple
 import argparse
 import shutil
+import tempfile
+import heapq
+import struct
+import threading
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 # 4K resolution threshold (3840x2160)
 MIN_4K_WIDTH = 3840
@@ -18,104 +25,300 @@ MIN_4K_HEIGHT = 2160
 
 # Supported image extensions
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', '.webp', '.svg', '.ico'}
+# Same set without the dot, for matching raw directory entry names
+IMAGE_EXTENSIONS_NO_DOT = {ext[1:] for ext in IMAGE_EXTENSIONS}
 
-def is_image_file(filepath):
-    """Check if a file is an image based on extension."""
-    return filepath.suffix.lower() in IMAGE_EXTENSIONS
+# Per-image scan record; a tuple keeps memory low on very large scans
+ImageInfo = namedtuple('ImageInfo', 'path width height size')
+
+# Maximum number of discovered files waiting to be analyzed
+SCAN_QUEUE_SIZE = 1024
+
+# Bytes compared at each end of a file when checking for duplicates
+FINGERPRINT_BYTES = 64
+
+# Maximum number of background moves queued at once
+MAX_PENDING_MOVES = 256
+
+# Minimum time between progress updates, in seconds
+PROGRESS_INTERVAL = 0.25
+
+# JPEG start-of-frame markers (SOF0-SOF15, excluding DHT, JPG and DAC)
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _read_jpeg_size(f):
+    """Walk JPEG segments until a start-of-frame marker and read its dimensions."""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            continue  # Standalone markers carry no length
+        if marker == 0xD9:
+            return None  # End of image without a frame header
+        segment = f.read(2)
+        if len(segment) < 2:
+            return None
+        length = struct.unpack('>H', segment)[0]
+        if marker in JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>xHH', frame)
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+def _read_size(filepath):
+    """Read image dimensions from the file header without decoding the image.
+    
+    Returns None for formats (or variants) that are not parsed here.
+    """
+    with open(filepath, 'rb') as f:
+        head = f.read(32)
+        if head[:2] == b'\xff\xd8':
+            return _read_jpeg_size(f)
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP' and len(head) >= 30:
+            chunk = head[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b'VP8L' and head[20] == 0x2F:
+                bits = struct.unpack('<I', head[21:25])[0]
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8X':
+                width = int.from_bytes(head[24:27], 'little') + 1
+                height = int.from_bytes(head[27:30], 'little') + 1
+                return width, height
+            return None
+        if head[:2] == b'BM' and len(head) >= 26:
+            header_size = struct.unpack('<I', head[14:18])[0]
+            if header_size == 12:
+                return struct.unpack('<HH', head[18:22])
+            width, height = struct.unpack('<ii', head[18:26])
+            return width, abs(height)
+    return None
+
+def _iter_images(root):
+    """Recursively yield (path, stat_result) for image files under root."""
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue  # Unreadable directory, skip it
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    stem, _, ext = entry.name.rpartition('.')
+                    if not (stem and ext.lower() in IMAGE_EXTENSIONS_NO_DOT and entry.is_file()):
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue  # Entry vanished or can't be stat'ed, skip only this one
+                yield entry.path, st
 
 def get_image_resolution(filepath):
     """Get the resolution of an image file."""
     try:
+        resolution = _read_size(filepath)
+        if resolution:
+            return resolution
+        # Fall back to PIL for formats without a header parser (TIFF, SVG, ICO, ...).
+        # Image.open() is lazy and .size comes from the header, so no pixel data
+        # is decoded here. Don't call draft() - it would shrink the reported size.
         with Image.open(filepath) as img:
             return img.size  # Returns (width, height)
     except Exception as e:
         print(f"Error reading {filepath}: {e}")
         return None
 
-def is_below_4k(width, height):
-    """Check if resolution is below 4K standard."""
-    return width < MIN_4K_WIDTH or height < MIN_4K_HEIGHT
+def analyze_image(image_file):
+    """Get the resolution and file size of an image (runs in a worker thread)."""
+    filepath, file_size = image_file
+    return filepath, get_image_resolution(filepath), file_size
+
+def _scan_producer(directory, tasks, num_workers):
+    """Feed image files from the directory walk into the task queue."""
+    try:
+        # Sizes come from the stat cached during the walk
+        for path, st in _iter_images(directory):
+            tasks.put((path, st.st_size))
+    finally:
+        # One sentinel per worker so every worker shuts down
+        for _ in range(num_workers):
+            tasks.put(None)
+
+def _scan_worker(tasks, results):
+    """Analyze queued images until a sentinel is received."""
+    try:
+        while True:
+            image_file = tasks.get()
+            if image_file is None:
+                break
+            results.put(analyze_image(image_file))
+    finally:
+        results.put(None)
+
+def file_fingerprint(filepath, size):
+    """Read the first and last FINGERPRINT_BYTES of a file for a cheap identity check."""
+    with open(filepath, 'rb') as f:
+        head = f.read(FINGERPRINT_BYTES)
+        f.seek(max(size - FINGERPRINT_BYTES, 0))
+        return head + f.read(FINGERPRINT_BYTES)
+
+def is_case_insensitive(directory, entries):
+    """Check whether file names in directory are matched case-insensitively.
+    
+    Probes inside directory itself, since a mount point can follow different
+    rules from its parent.
+    """
+    # Prefer looking up an existing entry under a case-swapped name
+    for entry in entries:
+        swapped = entry.name.swapcase()
+        if swapped == entry.name:
+            continue
+        try:
+            entry_stat = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        try:
+            return os.path.samestat(entry_stat, os.lstat(os.path.join(directory, swapped)))
+        except FileNotFoundError:
+            return False
+        except OSError:
+            continue
+    # No usable entry, so probe with a temporary file
+    try:
+        fd, probe = tempfile.mkstemp(prefix='.case-check-', dir=directory)
+    except OSError:
+        return True  # Can't tell; treating names as case-insensitive is the safe side
+    try:
+        probe_stat = os.fstat(fd)
+        os.close(fd)
+        head, name = os.path.split(probe)
+        try:
+            return os.path.samestat(probe_stat, os.lstat(os.path.join(head, name.upper())))
+        except FileNotFoundError:
+            return False
+        except OSError:
+            return True
+    finally:
+        os.unlink(probe)
+
+def destination_key(name, case_insensitive):
+    """Normalize a file name for comparing against destination entries."""
+    name = os.path.normcase(name)
+    return name.casefold() if case_insensitive else name
+
+def wait_for_move(future, source_file):
+    """Wait for a background move and report whether it succeeded."""
+    try:
+        future.result()
+        return True
+    except Exception as e:
+        print(f"  ✗ Failed to move {source_file.name}: {e}")
+        return False
 
 def format_resolution(width, height):
     """Format resolution for display."""
     return f"{width}x{height}"
 
+def relative_path(path, cwd_prefix):
+    """Strip cwd_prefix from a path for display, leaving other paths as they are."""
+    path = str(path)
+    return path[len(cwd_prefix):] if path.startswith(cwd_prefix) else path
+
 def find_low_res_images(directory="."):
     """Find all images below 4K resolution in directory and subdirectories."""
     directory = Path(directory)
     low_res_images = []
-    all_images = []
-    resolution_stats = defaultdict(int)
+    # Only paths are kept for high-res images to limit memory on huge scans
+    high_res_paths = []
+    resolution_stats = Counter()
     
     print(f"Scanning for images in: {directory.absolute()}")
-    print("Finding image files...", end='', flush=True)
-    
-    # First, collect all image files
-    image_files = []
-    for filepath in directory.rglob("*"):
-        if filepath.is_file() and is_image_file(filepath):
-            image_files.append(filepath)
-    
-    print(f" Found {len(image_files)} images")
     print("Analyzing resolutions...", flush=True)
     
-    # Process images with progress indicator
-    for i, filepath in enumerate(image_files, 1):
-        if i % 100 == 0:
-            print(f"  Processing: {i}/{len(image_files)} ({i*100//len(image_files)}%)", end='\r', flush=True)
+    # Stream files from the walk to worker threads so discovery overlaps
+    # with header reads and memory stays bounded on huge trees
+    num_workers = os.cpu_count() or 1
+    tasks = queue.Queue(maxsize=SCAN_QUEUE_SIZE)
+    results = queue.Queue()
+    threads = [threading.Thread(target=_scan_producer, args=(directory, tasks, num_workers), daemon=True)]
+    threads += [threading.Thread(target=_scan_worker, args=(tasks, results), daemon=True)
+                for _ in range(num_workers)]
+    for thread in threads:
+        thread.start()
+    
+    found_count = 0
+    active_workers = num_workers
+    next_progress = time.monotonic() + PROGRESS_INTERVAL
+    while active_workers:
+        result = results.get()
+        if result is None:
+            active_workers -= 1
+            continue
         
-        resolution = get_image_resolution(filepath)
+        found_count += 1
+        now = time.monotonic()
+        if now >= next_progress:
+            print(f"  Processing: {found_count} images", end='\r', flush=True)
+            next_progress = now + PROGRESS_INTERVAL
+        
+        filepath, resolution, file_size = result
         if resolution:
             width, height = resolution
-            res_key = format_resolution(width, height)
-            resolution_stats[res_key] += 1
-            
-            image_info = {
-                'path': filepath,
-                'width': width,
-                'height': height,
-                'size': filepath.stat().st_size
-            }
+            resolution_stats[resolution] += 1
             
-            all_images.append(image_info)
-            
-            if is_below_4k(width, height):
-                low_res_images.append(image_info)
+            # Below the 4K standard in either dimension
+            if width < MIN_4K_WIDTH or height < MIN_4K_HEIGHT:
+                low_res_images.append(ImageInfo(Path(filepath), width, height, file_size))
+            else:
+                high_res_paths.append(filepath)
     
-    print(f"  Processing: {len(image_files)}/{len(image_files)} (100%)    ")  # Clear the line
+    print(f"  Processed: {found_count} images    ")  # Clear the line
     print()
     
-    return low_res_images, all_images, resolution_stats
+    return low_res_images, high_res_paths, resolution_stats
 
-def display_results(low_res_images, all_images, resolution_stats):
+def display_results(low_res_images, high_res_paths, resolution_stats):
     """Display the results of the scan."""
     print("=" * 60)
     print("SCAN RESULTS")
     print("=" * 60)
     
-    print(f"\nTotal images found: {len(all_images)}")
+    print(f"\nTotal images found: {len(low_res_images) + len(high_res_paths)}")
     print(f"Images below 4K resolution: {len(low_res_images)}")
-    print(f"Images at or above 4K resolution: {len(all_images) - len(low_res_images)}")
+    print(f"Images at or above 4K resolution: {len(high_res_paths)}")
     
     if low_res_images:
         print(f"\n{'─' * 60}")
         print("LOW RESOLUTION IMAGES (Below 4K)")
         print(f"{'─' * 60}")
         
-        # Sort by resolution for better readability
-        low_res_images.sort(key=lambda x: (x['width'] * x['height']))
-        
-        # Show first 50 images if there are many
+        # Show the 50 smallest images if there are many, sorted by resolution
         display_count = min(50, len(low_res_images))
+        display_list = heapq.nsmallest(display_count, low_res_images,
+                                       key=lambda x: (x.width * x.height))
         
-        for i, img in enumerate(low_res_images[:display_count], 1):
-            size_mb = img['size'] / (1024 * 1024)
-            try:
-                rel_path = img['path'].relative_to(Path.cwd())
-            except ValueError:
-                # If relative path fails, just use the absolute path
-                rel_path = img['path']
-            print(f"{i:4d}. {format_resolution(img['width'], img['height']):12s} "
+        cwd_prefix = os.path.join(os.getcwd(), '')
+        for i, img in enumerate(display_list, 1):
+            size_mb = img.size / (1024 * 1024)
+            rel_path = relative_path(img.path, cwd_prefix)
+            print(f"{i:4d}. {format_resolution(img.width, img.height):12s} "
                   f"({size_mb:6.2f} MB) - {rel_path}")
         
         if len(low_res_images) > display_count:
@@ -125,10 +328,9 @@ def display_results(low_res_images, all_images, resolution_stats):
     print("RESOLUTION STATISTICS (Top 10)")
     print(f"{'─' * 60}")
     
-    # Sort resolutions by count
-    sorted_stats = sorted(resolution_stats.items(), key=lambda x: x[1], reverse=True)[:10]
-    for resolution, count in sorted_stats:
-        print(f"  {resolution:12s}: {count:4d} image(s)")
+    # Keys are (width, height) tuples; only the top entries get formatted
+    for (width, height), count in resolution_stats.most_common(10):
+        print(f"  {format_resolution(width, height):12s}: {count:4d} image(s)")
     
     if len(resolution_stats) > 10:
         print(f"  ... and {len(resolution_stats) - 10} more unique resolutions")
@@ -136,31 +338,37 @@ def display_results(low_res_images, all_images, resolution_stats):
 def delete_images(images):
     """Delete the specified images."""
     deleted_count = 0
-    failed_count = 0
     total_size_freed = 0
     deleted_images = []
+    failures = []
     
     print(f"\nDeleting {len(images)} images...")
     
-    for img in images:
+    # Plain strings let os.unlink skip the Path.__fspath__ call per file
+    paths = [str(img.path) for img in images]
+    
+    next_progress = time.monotonic() + PROGRESS_INTERVAL
+    for i, (img, path) in enumerate(zip(images, paths), 1):
+        now = time.monotonic()
+        if now >= next_progress:
+            print(f"  Progress: {i}/{len(images)} ({i*100//len(images)}%)", end='\r', flush=True)
+            next_progress = now + PROGRESS_INTERVAL
+        
         try:
-            size = img['size']
-            img['path'].unlink()
+            os.unlink(path)
             deleted_count += 1
-            total_size_freed += size
+            total_size_freed += img.size
             deleted_images.append(img)
-            try:
-                rel_path = img['path'].relative_to(Path.cwd())
-            except ValueError:
-                rel_path = img['path']
-            print(f"  ✓ Deleted: {rel_path}")
-        except Exception as e:
-            failed_count += 1
-            try:
-                rel_path = img['path'].relative_to(Path.cwd())
-            except ValueError:
-                rel_path = img['path']
-            print(f"  ✗ Failed to delete {rel_path}: {e}")
+        except OSError as e:
+            failures.append((path, e))
+    
+    print(f"  Progress: {len(images)}/{len(images)} (100%)    ")  # Finish the progress line
+    
+    # Only failures are listed individually
+    cwd_prefix = os.path.join(os.getcwd(), '')
+    for path, e in failures:
+        print(f"  ✗ Failed to delete {relative_path(path, cwd_prefix)}: {e}")
+    failed_count = len(failures)
     
     print(f"\n{'─' * 60}")
     print(f"Deletion complete:")
@@ -171,13 +379,13 @@ def delete_images(images):
     
     return deleted_images
 
-def move_high_res_images(high_res_images, source_dir):
+def move_high_res_images(high_res_paths, source_dir):
     """Move high-resolution images to a specified directory."""
     print(f"\n{'=' * 60}")
     print("MOVE HIGH-RESOLUTION IMAGES")
     print(f"{'=' * 60}")
     
-    print(f"\nYou have {len(high_res_images)} high-resolution images remaining.")
+    print(f"\nYou have {len(high_res_paths)} high-resolution images remaining.")
     print("Would you like to move them to a different directory?")
     
     response = input("\nMove high-resolution images? [y/N]: ").strip().lower()
@@ -221,76 +429,139 @@ def move_high_res_images(high_res_images, source_dir):
     overwritten_count = 0
     overwrite_all = False
     
-    print(f"\nMoving {len(high_res_images)} high-resolution images...")
-    
-    for i, img in enumerate(high_res_images, 1):
-        if i % 50 == 0:
-            print(f"  Progress: {i}/{len(high_res_images)} ({i*100//len(high_res_images)}%)")
-        
-        source_file = img['path']
-        dest_file = dest_path / source_file.name
-        
+    # Snapshot destination names once instead of probing each target path.
+    # Values are (actual path, DirEntry); entries moved in below have no
+    # DirEntry (no cached stat). Keys follow the destination's case rules so
+    # IMG.JPG still conflicts with img.jpg on case-insensitive volumes.
+    with os.scandir(dest_path) as it:
+        dest_entries = list(it)
+    case_insensitive = is_case_insensitive(dest_path, dest_entries)
+    existing = {destination_key(entry.name, case_insensitive): (entry.path, entry)
+                for entry in dest_entries}
+    
+    print(f"\nMoving {len(high_res_paths)} high-resolution images...")
+    
+    # Non-conflicting moves run on worker threads; conflicts stay on the
+    # main thread, which alone updates existing/pending, so a destination
+    # name is never claimed twice
+    pending = {}
+    with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2) as executor:
         try:
-            # Check if destination file exists
-            if dest_file.exists():
-                # Check if it's the same file (by size and resolution)
-                dest_resolution = get_image_resolution(dest_file)
-                if dest_resolution and dest_resolution == (img['width'], img['height']) and \
-                   dest_file.stat().st_size == img['size']:
-                    # Same file, skip
-                    skipped_count += 1
-                    continue
+            next_progress = time.monotonic() + PROGRESS_INTERVAL
+            for i, path in enumerate(high_res_paths, 1):
+                now = time.monotonic()
+                if now >= next_progress:
+                    print(f"  Progress: {i}/{len(high_res_paths)} ({i*100//len(high_res_paths)}%)", end='\r', flush=True)
+                    next_progress = now + PROGRESS_INTERVAL
                 
-                # Different file with same name - check if we should overwrite all
-                if overwrite_all:
-                    shutil.move(str(source_file), str(dest_file))
-                    moved_count += 1
-                    overwritten_count += 1
-                else:
-                    # Ask for confirmation
-                    print(f"\n  Conflict: '{source_file.name}' already exists in destination")
-                    print(f"    Source: {img['width']}x{img['height']} ({img['size'] / (1024*1024):.2f} MB)")
-                    if dest_resolution:
-                        dest_size = dest_file.stat().st_size
-                        print(f"    Destination: {dest_resolution[0]}x{dest_resolution[1]} ({dest_size / (1024*1024):.2f} MB)")
-                    
-                    action = input("    Overwrite? [y/N/a (yes to all)]: ").strip().lower()
+                source_file = Path(path)
+                dest_file = dest_path / source_file.name
+                name_key = destination_key(source_file.name, case_insensitive)
+                
+                try:
+                    # A pending background move to this name must land before comparing
+                    if name_key in pending:
+                        future, pending_source = pending.pop(name_key)
+                        if wait_for_move(future, pending_source):
+                            moved_count += 1
+                        else:
+                            failed_count += 1
+                            del existing[name_key]
                     
-                    if action == 'a':
-                        # Set flag to overwrite all
-                        overwrite_all = True
-                        shutil.move(str(source_file), str(dest_file))
-                        moved_count += 1
-                        overwritten_count += 1
-                    elif action in ['y', 'yes']:
-                        shutil.move(str(source_file), str(dest_file))
-                        moved_count += 1
-                        overwritten_count += 1
+                    # Check if destination file exists
+                    if name_key in existing:
+                        # The matched file may differ from dest_file in case only;
+                        # dest_file stays the move target
+                        dest_match, dest_entry = existing[name_key]
+                        dest_size = dest_entry.stat().st_size if dest_entry else os.stat(dest_match).st_size
+                        source_size = source_file.stat().st_size
+                        # Check if it's the same file (by size, then head/tail bytes)
+                        if dest_size == source_size and \
+                           file_fingerprint(dest_match, dest_size) == file_fingerprint(source_file, source_size):
+                            # Same file, skip
+                            skipped_count += 1
+                            continue
+                        
+                        # Different file with same name - check if we should overwrite all
+                        if overwrite_all:
+                            shutil.move(str(source_file), str(dest_file))
+                            moved_count += 1
+                            overwritten_count += 1
+                            existing[name_key] = (dest_file, None)
+                        else:
+                            # Ask for confirmation
+                            print(f"\n  Conflict: '{source_file.name}' already exists in destination")
+                            source_resolution = get_image_resolution(source_file)
+                            if source_resolution:
+                                print(f"    Source: {source_resolution[0]}x{source_resolution[1]} ({source_size / (1024*1024):.2f} MB)")
+                            dest_resolution = get_image_resolution(dest_match)
+                            if dest_resolution:
+                                print(f"    Destination: {dest_resolution[0]}x{dest_resolution[1]} ({dest_size / (1024*1024):.2f} MB)")
+                            
+                            action = input("    Overwrite? [y/N/a (yes to all)]: ").strip().lower()
+                            
+                            if action == 'a':
+                                # Set flag to overwrite all
+                                overwrite_all = True
+                                shutil.move(str(source_file), str(dest_file))
+                                moved_count += 1
+                                overwritten_count += 1
+                                existing[name_key] = (dest_file, None)
+                            elif action in ['y', 'yes']:
+                                shutil.move(str(source_file), str(dest_file))
+                                moved_count += 1
+                                overwritten_count += 1
+                                existing[name_key] = (dest_file, None)
+                            else:
+                                skipped_count += 1
                     else:
-                        skipped_count += 1
-            else:
-                # No conflict, move the file
-                shutil.move(str(source_file), str(dest_file))
-                moved_count += 1
-                
-        except Exception as e:
-            failed_count += 1
-            print(f"  ✗ Failed to move {source_file.name}: {e}")
+                        # Keep the number of queued moves bounded so an interrupt
+                        # leaves little work behind and memory stays flat
+                        if len(pending) >= MAX_PENDING_MOVES:
+                            done, _ = wait([future for future, _ in pending.values()],
+                                           return_when=FIRST_COMPLETED)
+                            for key in [key for key, (future, _) in pending.items() if future in done]:
+                                future, pending_source = pending.pop(key)
+                                if wait_for_move(future, pending_source):
+                                    moved_count += 1
+                                else:
+                                    failed_count += 1
+                                    del existing[key]
+                        
+                        # No conflict, move the file in the background
+                        future = executor.submit(shutil.move, str(source_file), str(dest_file))
+                        pending[name_key] = (future, source_file)
+                        existing[name_key] = (dest_file, None)
+                        
+                except Exception as e:
+                    failed_count += 1
+                    print(f"  ✗ Failed to move {source_file.name}: {e}")
+            
+            moves = dict(pending.values())
+            for future in as_completed(moves):
+                if wait_for_move(future, moves[future]):
+                    moved_count += 1
+                else:
+                    failed_count += 1
+        except BaseException:
+            # Don't carry out queued moves after Ctrl-C or an unexpected error
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+    
+    print(f"  Progress: {len(high_res_paths)}/{len(high_res_paths)} (100%)    ")  # Finish the progress line
     
     # Clean up empty directories
     print("\nCleaning up empty directories...")
     cleaned_dirs = []
-    for img in high_res_images:
-        parent_dir = img['path'].parent
-        if parent_dir != source_dir and parent_dir.exists():
-            try:
-                # Check if directory is empty
-                if not any(parent_dir.iterdir()):
-                    parent_dir.rmdir()
-                    if parent_dir not in cleaned_dirs:
-                        cleaned_dirs.append(parent_dir)
-            except:
-                pass  # Directory not empty or can't be removed
+    parent_dirs = {Path(path).parent for path in high_res_paths}
+    parent_dirs.discard(source_dir)
+    # Deepest directories first so children are removed before their parents
+    for parent_dir in sorted(parent_dirs, key=lambda d: len(d.parts), reverse=True):
+        try:
+            parent_dir.rmdir()
+            cleaned_dirs.append(parent_dir)
+        except OSError:
+            pass  # Directory not empty or can't be removed
     
     print(f"\n{'─' * 60}")
     print("Move operation complete:")
@@ -315,17 +586,17 @@ def main():
     args = parser.parse_args()
     
     # Find low resolution images
-    low_res_images, all_images, resolution_stats = find_low_res_images(args.directory)
+    low_res_images, high_res_paths, resolution_stats = find_low_res_images(args.directory)
     
     # Display results
-    display_results(low_res_images, all_images, resolution_stats)
+    display_results(low_res_images, high_res_paths, resolution_stats)
     
     if not low_res_images:
         print("\n✓ No images below 4K resolution found!")
         return 0
     
     # Calculate total size
-    total_size = sum(img['size'] for img in low_res_images)
+    total_size = sum(img.size for img in low_res_images)
     total_size_mb = total_size / (1024 * 1024)
     
     print(f"\n{'=' * 60}")
@@ -354,12 +625,9 @@ def main():
     
     # If images were deleted, offer to move high-res images
     if deleted_images:
-        # Find remaining high-res images (those not deleted)
-        deleted_paths = {img['path'] for img in deleted_images}
-        high_res_images = [img for img in all_images if img['path'] not in deleted_paths]
-        
-        if high_res_images:
-            move_high_res_images(high_res_images, Path(args.directory))
+        # Only low-res images are deleted, so every high-res path remains
+        if high_res_paths:
+            move_high_res_images(high_res_paths, Path(args.directory))
     
     return 0
 